@@ -84,6 +84,11 @@ def main():
     within the 'models_ns' directory. See the existing files for examples
     drawn from the paper Sokoloff et al. 1998, MNRAS 229, pg 189.
 
+    If a model file defines model_qu(pDict, lamSqArr_m2, qArr, uArr), that is
+    the function fitted by the sampler, and model() must remain a wrapper
+    around it (model() is used for the plots and the chi-squared). A model
+    file may instead define only model(), which is then used throughout.
+
     Main algorithm handles the command line interface, passing all arguments
     one to run_qufit().
     """
@@ -104,6 +109,11 @@ def main():
     Models and priors are  specified as Python code in files called 'mX.py'
     within the 'models_ns' directory. See the existing files for examples
     drawn from the paper Sokoloff et al. 1998, MNRAS 229, pg 189.
+
+    If a model file defines model_qu(pDict, lamSqArr_m2, qArr, uArr), that is
+    the function fitted by the sampler, and model() must remain a wrapper
+    around it (model() is used for the plots and the chi-squared). A model
+    file may instead define only model(), which is then used throughout.
     """
 
     # Parse the command line options
@@ -206,7 +216,7 @@ def load_model(modelNum, verbose=False):
             "m%d" % modelNum, "models_ns/m%d.py" % modelNum
         )
         mod = importlib.util.module_from_spec(spec)
-        sys.modules[mod] = mod
+        sys.modules[spec.name] = mod
         spec.loader.exec_module(mod)
     except FileNotFoundError:
         try:
@@ -215,7 +225,7 @@ def load_model(modelNum, verbose=False):
                 "m%d" % modelNum, RMtools_dir + "/models_ns/m%d.py" % modelNum
             )
             mod = importlib.util.module_from_spec(spec)
-            sys.modules[mod] = mod
+            sys.modules[spec.name] = mod
             spec.loader.exec_module(mod)
         except:
             print(
@@ -267,7 +277,9 @@ def run_qufit(
         working directory.
     polyOrd (int): Order of polynomial to fit to Stokes I spectrum (used to
         normalize Q and U values). Defaults to 3 (cubic).
-    nBits (int): number of bits to use in internal calculations.
+    nBits (int): number of bits to use in internal calculations. The
+        likelihood is also evaluated at this precision, unless the data
+        arrays are of higher precision (e.g. float64), which is kept.
     noStokesI (bool): set True if the Stokes I spectrum should be ignored.
     showPlots (bool): Set true if the spectrum and parameter space plots
         should be displayed.
@@ -275,6 +287,14 @@ def run_qufit(
         mean of each mode in the parameter postierors.
     debug (bool): Display debug messages.
     verbose (bool): Print verbose messages/results to terminal.
+    sampler (str): Name of the bilby sampler to use. Defaults to 'dynesty'.
+    fit_function (str): Stokes I fitting function: 'linear' or 'log'
+        polynomials. Defaults to 'log'.
+    ncores (int): Number of worker processes the sampler uses to evaluate
+        the likelihood of its live points in parallel. Each worker holds
+        its own copy of the likelihood and loads the model once.
+    nlive (int): Number of live points to use for sampling.
+    prefixOut (str): Prefix for the output files.
 
     Returns: nothing. Results saved to files and/or printed to terminal."""
 
@@ -379,11 +399,29 @@ def run_qufit(
     fixedMsk = [0 if x == "DeltaFunction" else 1 for x in priorTypes]
     nFree = sum(fixedMsk)
 
+    # The sampler fits model_qu, but the plots and chi-squared use model(),
+    # so warn if an edited model file has let the two drift apart. The check
+    # point is the median of each prior, which is finite even for unbounded
+    # priors and leaves the sampler's random state untouched
+    if hasattr(mod, "model_qu"):
+        pDict = {k: mod.priors[k].rescale(0.5) for k in parNames}
+        qChkArr = np.empty_like(lamSqArr_m2)
+        uChkArr = np.empty_like(lamSqArr_m2)
+        mod.model_qu(pDict, lamSqArr_m2, qChkArr, uChkArr)
+        quChkArr = qChkArr + 1j * uChkArr
+        if not np.allclose(model(pDict, lamSqArr_m2), quChkArr, equal_nan=True):
+            print(
+                "Warning: model() and model_qu() in 'm%d.py' disagree. The "
+                "sampler fits model_qu(); model() should wrap it." % modelNum
+            )
+
     # Set the prior function given the bounds of each parameter
     priors = mod.priors
 
     # Set the likelihood function given the data
-    lnlike = lnlike_call(parNames, lamSqArr_m2, qArr, dqArr, uArr, duArr, modelNum)
+    lnlike = lnlike_call(
+        parNames, lamSqArr_m2, qArr, dqArr, uArr, duArr, modelNum, nBits=nBits
+    )
     # Let's time the sampler
     startTime = time.time()
 
@@ -601,34 +639,87 @@ def run_qufit(
 
 # -----------------------------------------------------------------------------#
 class lnlike_call(bilby.Likelihood):
-    """Returns a function to evaluate the log-likelihood"""
-
-    def __init__(self, parNames, lamSqArr_m2, qArr, dqArr, uArr, duArr, modelNum):
+    """Returns a function to evaluate the log-likelihood
+
+    The model spectra are evaluated at the precision given by nBits, or at
+    the precision of qArr and uArr if that is higher, so float64 data are
+    never sampled in float32. For float32 data the measurement noise is far
+    above float32 rounding, and 32 bits roughly halves the memory traffic
+    of the model."""
+
+    def __init__(
+        self, parNames, lamSqArr_m2, qArr, dqArr, uArr, duArr, modelNum, nBits=64
+    ):
+        dtFloat = np.result_type("float" + str(nBits), qArr, uArr)
         self.parNames = parNames
-        self.lamSqArr_m2 = lamSqArr_m2
+        self.lamSqArr_m2 = lamSqArr_m2.astype(dtFloat)
         self.qArr = qArr
         self.dqArr = dqArr
         self.uArr = uArr
         self.duArr = duArr
         self.modelNum = modelNum
+        self._mod = None
+        # Model spectra are written into these on every evaluation
+        self._qMod = np.empty(lamSqArr_m2.shape, dtype=dtFloat)
+        self._uMod = np.empty(lamSqArr_m2.shape, dtype=dtFloat)
+        # Specialise the data to the evaluation precision once: flagged (NaN)
+        # channels get zero data and zero weight, so they drop out of the
+        # chi^2 without a nansum, and the per-channel divide by the
+        # uncertainty becomes a multiply by a precomputed weight
+        with np.errstate(divide="ignore"):
+            wtArr = 1.0 / dqArr
+        qMsk = np.isfinite(qArr) & np.isfinite(dqArr)
+        uMsk = np.isfinite(uArr) & np.isfinite(dqArr)
+        self._qDatArr = np.where(qMsk, qArr, 0.0).astype(dtFloat)
+        self._uDatArr = np.where(uMsk, uArr, 0.0).astype(dtFloat)
+        self._qWtArr = np.where(qMsk, wtArr, 0.0).astype(dtFloat)
+        self._uWtArr = np.where(uMsk, wtArr, 0.0).astype(dtFloat)
+        # Normalisation of the likelihood depends only on the data
+        dquArr = np.sqrt(np.power(dqArr, 2) + np.power(duArr, 2))
+        nData = len(dquArr)
+        self._logNorm = -nData * np.log(2.0 * np.pi) - 2.0 * np.nansum(np.log(dquArr))
         pDict = {k: None for k in parNames}
         super().__init__(parameters=pDict)
 
+    @property
+    def mod(self):
+        # Load the model file once per process, not on every evaluation
+        if self._mod is None:
+            self._mod = load_model(self.modelNum)
+        return self._mod
+
+    def __getstate__(self):
+        # The loaded model module cannot be pickled for the sampler pool;
+        # each worker reloads it on first use instead
+        state = self.__dict__.copy()
+        state["_mod"] = None
+        return state
+
     def log_likelihood(self):
         # Evaluate the model and calculate the joint ln(like)
         # Silva 2006
-        model = load_model(self.modelNum).model
-        quMod = model(self.parameters, self.lamSqArr_m2)
-        dquArr = np.sqrt(np.power(self.dqArr, 2) + np.power(self.duArr, 2))
-        chiSqQ = np.nansum(np.power((self.qArr - quMod.real) / self.dqArr, 2))
-        chiSqU = np.nansum(np.power((self.uArr - quMod.imag) / self.dqArr, 2))
-        nData = len(dquArr)
-        logLike = (
-            -nData * np.log(2.0 * np.pi)
-            - 2.0 * np.nansum(np.log(dquArr))
-            - chiSqQ / 2.0
-            - chiSqU / 2.0
-        )
+        qMod, uMod = self._qMod, self._uMod
+        if hasattr(self.mod, "model_qu"):
+            # Model fills the preallocated q and u arrays directly
+            self.mod.model_qu(self.parameters, self.lamSqArr_m2, qMod, uMod)
+        else:
+            quMod = self.mod.model(self.parameters, self.lamSqArr_m2)
+            qMod[:] = quMod.real
+            uMod[:] = quMod.imag
+        # Normalised residuals are formed in place in the model arrays
+        np.subtract(self._qDatArr, qMod, out=qMod)
+        np.multiply(qMod, self._qWtArr, out=qMod)
+        np.subtract(self._uDatArr, uMod, out=uMod)
+        np.multiply(uMod, self._uWtArr, out=uMod)
+        # Reduce each to chi^2 with a single inner product, falling back to
+        # nansum only if the model itself produced a NaN
+        chiSqQ = np.dot(qMod, qMod)
+        if not np.isfinite(chiSqQ):
+            chiSqQ = np.nansum(np.square(qMod))
+        chiSqU = np.dot(uMod, uMod)
+        if not np.isfinite(chiSqU):
+            chiSqU = np.nansum(np.square(uMod))
+        logLike = self._logNorm - chiSqQ / 2.0 - chiSqU / 2.0
 
         return logLike
 
@@ -4,15 +4,26 @@
 import bilby
 import numpy as np
 
+from RMutils.util_misc import evaluate_qu_model
+
 
 # -----------------------------------------------------------------------------#
-# Function defining the model.                                                #
+# Functions defining the model.                                               #
+#                                                                             #
+#  model_qu    = The function fitted by the sampler. It fills the real arrays #
+#                qArr and uArr with the q and u spectra. Edit this function   #
+#                to change the model.                                         #
+#  model       = Returns the same spectra as one complex array, for the plots #
+#                and the chi-squared. Keep it as a wrapper around model_qu.   #
+#                A model file may instead define only model(), which is       #
+#                then used for everything (see e.g. m2.py).                   #
 #                                                                             #
 #  pDict       = Dictionary of parameters, created by parsing inParms, below. #
 #  lamSqArr_m2 = Array of lambda-squared values                               #
+#  qArr, uArr  = Real arrays to be filled with the q and u spectra.           #
 #  quArr       = Complex array containing the Re and Im spectra.              #
 # -----------------------------------------------------------------------------#
-def model(pDict, lamSqArr_m2):
+def model_qu(pDict, lamSqArr_m2, qArr, uArr):
     """
 
     Simple Faraday thin source
@@ -24,15 +35,18 @@ def model(pDict, lamSqArr_m2):
 
     """
 
-    # Calculate the complex fractional q and u spectra
-    # fmt: off
-    pArr = pDict["fracPol"] * np.ones_like(lamSqArr_m2)
-    quArr = pArr * np.exp(
-        2j * (np.radians(pDict["psi0_deg"]) + pDict["RM_radm2"] * lamSqArr_m2)
-    )
-    # fmt: on
+    # Calculate the fractional q and u spectra
+    # q + iu = p * exp(2i * (psi0 + RM * lambda^2))
+    psi0_rad = pDict["psi0_deg"] * (np.pi / 180.0)
+    phiArr = 2.0 * psi0_rad + 2.0 * pDict["RM_radm2"] * lamSqArr_m2
+    qArr[...] = pDict["fracPol"] * np.cos(phiArr)
+    uArr[...] = pDict["fracPol"] * np.sin(phiArr)
+
+
+def model(pDict, lamSqArr_m2):
+    """Return the model as a complex array of the q and u spectra."""
 
-    return quArr
+    return evaluate_qu_model(model_qu, pDict, lamSqArr_m2)
 
 
 # -----------------------------------------------------------------------------#
@@ -5,15 +5,26 @@ import bilby
 import numpy as np
 from bilby.core.prior import Constraint, PriorDict
 
+from RMutils.util_misc import evaluate_qu_model
+
 
 # -----------------------------------------------------------------------------#
-# Function defining the model.                                                #
+# Functions defining the model.                                               #
+#                                                                             #
+#  model_qu    = The function fitted by the sampler. It fills the real arrays #
+#                qArr and uArr with the q and u spectra. Edit this function   #
+#                to change the model.                                         #
+#  model       = Returns the same spectra as one complex array, for the plots #
+#                and the chi-squared. Keep it as a wrapper around model_qu.   #
+#                A model file may instead define only model(), which is       #
+#                then used for everything (see e.g. m2.py).                   #
 #                                                                             #
 #  pDict       = Dictionary of parameters, created by parsing inParms, below. #
 #  lamSqArr_m2 = Array of lambda-squared values                               #
+#  qArr, uArr  = Real arrays to be filled with the q and u spectra.           #
 #  quArr       = Complex array containing the Re and Im spectra.              #
 # -----------------------------------------------------------------------------#
-def model(pDict, lamSqArr_m2):
+def model_qu(pDict, lamSqArr_m2, qArr, uArr):
     """
 
     Three separate Faraday thin sources
@@ -26,21 +37,28 @@ def model(pDict, lamSqArr_m2):
 
     """
 
-    # Calculate the complex fractional q and u spectra
+    # Calculate the fractional q and u spectra
+    # q + iu = sum_k p_k * exp(2i * (psi0_k + RM_k * lambda^2))
     # fmt: off
-    pArr1 = pDict["fracPol1"] * np.ones_like(lamSqArr_m2)
-    pArr2 = pDict["fracPol2"] * np.ones_like(lamSqArr_m2)
-    pArr3 = pDict["fracPol3"] * np.ones_like(lamSqArr_m2)
-    quArr1 = pArr1 * np.exp( 2j * (np.radians(pDict["psi01_deg"]) +
-                                   pDict["RM1_radm2"] * lamSqArr_m2))
-    quArr2 = pArr2 * np.exp( 2j * (np.radians(pDict["psi02_deg"]) +
-                                   pDict["RM2_radm2"] * lamSqArr_m2))
-    quArr3 = pArr3 * np.exp( 2j * (np.radians(pDict["psi03_deg"]) +
-                                   pDict["RM3_radm2"] * lamSqArr_m2))
-    quArr = (quArr1 + quArr2 + quArr3)
+    psi01_rad = pDict["psi01_deg"] * (np.pi / 180.0)
+    psi02_rad = pDict["psi02_deg"] * (np.pi / 180.0)
+    psi03_rad = pDict["psi03_deg"] * (np.pi / 180.0)
+    phiArr1 = 2.0 * psi01_rad + 2.0 * pDict["RM1_radm2"] * lamSqArr_m2
+    phiArr2 = 2.0 * psi02_rad + 2.0 * pDict["RM2_radm2"] * lamSqArr_m2
+    phiArr3 = 2.0 * psi03_rad + 2.0 * pDict["RM3_radm2"] * lamSqArr_m2
+    qArr[...] = (pDict["fracPol1"] * np.cos(phiArr1) +
+                pDict["fracPol2"] * np.cos(phiArr2) +
+                pDict["fracPol3"] * np.cos(phiArr3))
+    uArr[...] = (pDict["fracPol1"] * np.sin(phiArr1) +
+                pDict["fracPol2"] * np.sin(phiArr2) +
+                pDict["fracPol3"] * np.sin(phiArr3))
     # fmt: on
 
-    return quArr
+
+def model(pDict, lamSqArr_m2):
+    """Return the model as a complex array of the q and u spectra."""
+
+    return evaluate_qu_model(model_qu, pDict, lamSqArr_m2)
 
 
 # -----------------------------------------------------------------------------#
@@ -23,14 +23,13 @@ def model(pDict, lamSqArr_m2):
     """
 
     # Calculate the complex fractional q and u spectra
-    pArr = pDict["fracPol"] * np.ones_like(lamSqArr_m2)
     para_S = (
         2.0 * lamSqArr_m2**2 * pDict["sigmaRM_radm2"] ** 2
         - 2j * lamSqArr_m2 * pDict["deltaRM_radm2"]
     )
 
     quArr = (
-        pArr
+        pDict["fracPol"]
         * np.exp(
             2j * (np.radians(pDict["psi0_deg"]) + pDict["RM_screen"] * lamSqArr_m2)
         )
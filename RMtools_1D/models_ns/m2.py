@@ -27,9 +27,8 @@ def model(pDict, lamSqArr_m2):
 
     # Calculate the complex fractional q and u spectra
     # fmt: off
-    pArr = pDict["fracPol"] * np.ones_like(lamSqArr_m2)
     quArr = (
-        pArr
+        pDict["fracPol"]
         * np.exp(2j * (np.radians(pDict["psi0_deg"]) + pDict["RM_radm2"] * lamSqArr_m2))
         * np.exp(-2.0 * pDict["sigmaRM_radm2"] ** 2.0 * lamSqArr_m2**2.0)
     )
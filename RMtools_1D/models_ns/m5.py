@@ -28,12 +28,10 @@ def model(pDict, lamSqArr_m2):
 
     # Calculate the complex fractional q and u spectra
     # fmt: off
-    pArr = pDict["fracPol"] * np.ones_like(lamSqArr_m2)
-    quArr = (pArr * np.exp( 2j * (np.radians(pDict["psi0_deg"]) +
-                                  (0.5*pDict["deltaRM_radm2"] +
-                                   pDict["RM_radm2"]) * lamSqArr_m2))
-             * np.sin(pDict["deltaRM_radm2"] * lamSqArr_m2) /
-               (pDict["deltaRM_radm2"] * lamSqArr_m2))
+    quArr = (pDict["fracPol"] * np.exp( 2j * (np.radians(pDict["psi0_deg"]) +
+                                              (0.5*pDict["deltaRM_radm2"] +
+                                               pDict["RM_radm2"]) * lamSqArr_m2))
+             * np.sinc(pDict["deltaRM_radm2"] * lamSqArr_m2 / np.pi))
     # fmt: on
 
     return quArr
@@ -28,11 +28,10 @@ def model(pDict, lamSqArr_m2):
     # fmt: off
 
     # Calculate the complex fractional q and u spectra
-    pArr = pDict["fracPol"] * np.ones_like(lamSqArr_m2)
     para_S = (2. * lamSqArr_m2**2 * pDict["sigmaRM_radm2"]**2 -
              2j * lamSqArr_m2 * pDict["deltaRM_radm2"])
-    quArr = (pArr * np.exp( 2j * (np.radians(pDict["psi0_deg"]) +
-                                  pDict["RM_radm2"] * lamSqArr_m2)) *
+    quArr = (pDict["fracPol"] * np.exp( 2j * (np.radians(pDict["psi0_deg"]) +
+                                              pDict["RM_radm2"] * lamSqArr_m2)) *
             (1 - np.exp(-1.*para_S)) / para_S)
     # fmt: on
 
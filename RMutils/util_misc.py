@@ -41,6 +41,7 @@
 #  create_pqu_resid_RMthin ... return fractional spectra - a thin component   #
 #  xfloat               ... convert to float, default to None on fail         #
 #  norm_cdf             ... calculate the CDF of a Normal distribution        #
+#  evaluate_qu_model    ... complex q + iu spectra from a QU-fitting model_qu #
 #                                                                             #
 # =============================================================================#
 #                                                                             #
@@ -1377,3 +1378,38 @@ def norm_cdf(mean=0.0, std=1.0, N=50, xArr=None):
     y = norm.cdf(x, loc=mean, scale=std)
 
     return x, y
+
+
+# -----------------------------------------------------------------------------#
+def evaluate_qu_model(model_qu, pDict, lamSqArr_m2, blockSize=64):
+    """Return the complex q + iu spectra of a QU-fitting model, given its
+    model_qu(pDict, lamSqArr_m2, qArr, uArr) function.
+
+    Parameters may be scalars, or arrays of shape (W, 1) to evaluate W
+    parameter sets at once, giving spectra of shape (W, N); lamSqArr_m2 may
+    likewise be of shape (W, N). Batches are evaluated blockSize parameter
+    sets at a time so that the temporaries inside model_qu stay small enough
+    to remain in cache."""
+
+    # pDict may be any mapping of parameter names, e.g. a pandas Series row
+    shape = np.broadcast_shapes(
+        np.shape(lamSqArr_m2), *(np.shape(pDict[k]) for k in pDict.keys())
+    )
+    quArr = np.empty(shape, dtype=np.complex128)
+    if len(shape) <= 1:
+        model_qu(pDict, lamSqArr_m2, quArr.real, quArr.imag)
+        # A scalar lambda^2 gives a scalar, as from a plain model()
+        return quArr[()]
+
+    def _block(x, blk):
+        # Only inputs spanning the batch axis are sliced; the rest broadcast
+        if np.ndim(x) == len(shape) and np.shape(x)[0] == shape[0]:
+            return x[blk]
+        return x
+
+    for i in range(0, shape[0], blockSize):
+        blk = slice(i, i + blockSize)
+        pBlkDict = {k: _block(pDict[k], blk) for k in pDict.keys()}
+        model_qu(pBlkDict, _block(lamSqArr_m2, blk), quArr.real[blk], quArr.imag[blk])
+
+    return quArr
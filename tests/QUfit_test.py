@@ -0,0 +1,207 @@
+"""Tests for the QU-fitting likelihood and models."""
+
+import pickle
+import unittest
+
+import numpy as np
+import pandas as pd
+from astropy.constants import c as speed_of_light
+
+from RMtools_1D.do_QUfit_1D_mnest import lnlike_call, load_model
+from RMutils.util_misc import evaluate_qu_model
+
+
+def make_qu_data(modelNum, pDict, nChan=288, noise=0.01, seed=42):
+    """Simulate fractional q and u spectra for the given model."""
+    rng = np.random.default_rng(seed)
+    freqArr_Hz = np.linspace(700e6, 1800e6, nChan)
+    lamSqArr_m2 = np.power(speed_of_light.value / freqArr_Hz, 2.0)
+    quArr = load_model(modelNum).model(pDict, lamSqArr_m2)
+    qArr = quArr.real + rng.normal(scale=noise, size=nChan)
+    uArr = quArr.imag + rng.normal(scale=noise, size=nChan)
+    dqArr = np.full(nChan, noise)
+    duArr = np.full(nChan, noise)
+    return lamSqArr_m2, qArr, dqArr, uArr, duArr
+
+
+# A fixed parameter set for each model providing model_qu
+MODEL_PDICTS = {
+    1: {"fracPol": 0.5, "psi0_deg": 30.0, "RM_radm2": 20.0},
+    6: {
+        "fracPol1": 0.3,
+        "fracPol2": 0.2,
+        "psi01_deg": 40.0,
+        "psi02_deg": 120.0,
+        "RM1_radm2": 50.0,
+        "RM2_radm2": -30.0,
+        "deltaRM1_radm2": 10.0,
+        "deltaRM2_radm2": 25.0,
+    },
+    11: {
+        "fracPol1": 0.3,
+        "fracPol2": 0.2,
+        "psi01_deg": 40.0,
+        "psi02_deg": 120.0,
+        "RM1_radm2": 50.0,
+        "RM2_radm2": -30.0,
+    },
+    111: {
+        "fracPol1": 0.3,
+        "fracPol2": 0.2,
+        "fracPol3": 0.1,
+        "psi01_deg": 40.0,
+        "psi02_deg": 120.0,
+        "psi03_deg": 10.0,
+        "RM1_radm2": 50.0,
+        "RM2_radm2": -30.0,
+        "RM3_radm2": 300.0,
+    },
+}
+
+
+class test_QUfit(unittest.TestCase):
+    def setUp(self):
+        self.pDict = {"fracPol": 0.5, "psi0_deg": 30.0, "RM_radm2": 20.0}
+        self.data = make_qu_data(1, self.pDict)
+
+    def test_lnlike_pickle(self):
+        """Tests the likelihood survives pickling for the sampler pool."""
+        lnlike = lnlike_call(list(self.pDict), *self.data, modelNum=1)
+        lnlike.parameters.update(self.pDict)
+        logL = lnlike.log_likelihood()
+
+        lnlike2 = pickle.loads(pickle.dumps(lnlike))
+        self.assertIsNone(lnlike2._mod)
+        self.assertEqual(lnlike2.log_likelihood(), logL)
+
+    def test_lnlike_peak(self):
+        """Tests the likelihood prefers the true parameters."""
+        lnlike = lnlike_call(list(self.pDict), *self.data, modelNum=1)
+        lnlike.parameters.update(self.pDict)
+        logL_true = lnlike.log_likelihood()
+        lnlike.parameters.update({"RM_radm2": 25.0})
+        self.assertGreater(logL_true, lnlike.log_likelihood())
+
+    def test_lnlike_flagged(self):
+        """Tests NaN (flagged) channels are left out of the chi-squared."""
+        lamSqArr_m2, qArr, dqArr, uArr, duArr = self.data
+        qArr = qArr.copy()
+        qArr[[3, 10]] = np.nan
+        lnlike = lnlike_call(
+            list(self.pDict), lamSqArr_m2, qArr, dqArr, uArr, duArr, modelNum=1
+        )
+        pDict = dict(self.pDict, RM_radm2=25.0)
+        lnlike.parameters.update(pDict)
+
+        quArr = load_model(1).model(pDict, lamSqArr_m2)
+        dquArr = np.sqrt(dqArr**2 + duArr**2)
+        logL = (
+            -len(dquArr) * np.log(2.0 * np.pi)
+            - 2.0 * np.sum(np.log(dquArr))
+            - np.nansum(((qArr - quArr.real) / dqArr) ** 2) / 2.0
+            - np.sum(((uArr - quArr.imag) / dqArr) ** 2) / 2.0
+        )
+        self.assertAlmostEqual(lnlike.log_likelihood(), logL, places=6)
+
+    def test_lnlike_nbits(self):
+        """Tests 32-bit evaluation of float32 data matches the 64-bit likelihood."""
+        pDict = MODEL_PDICTS[111]
+        data32 = [a.astype(np.float32) for a in make_qu_data(111, pDict)]
+        data64 = [a.astype(np.float64) for a in data32]
+        lnlike64 = lnlike_call(list(pDict), *data64, modelNum=111)
+        lnlike32 = lnlike_call(list(pDict), *data32, modelNum=111, nBits=32)
+        self.assertEqual(lnlike32._qMod.dtype, np.float32)
+
+        # Points within the posterior, where logL differences matter
+        for pOffDict in (
+            {},
+            {"RM1_radm2": 50.05},
+            {"psi01_deg": 40.5, "fracPol2": 0.201},
+            {"RM3_radm2": 300.1, "fracPol1": 0.299},
+        ):
+            lnlike64.parameters.update(dict(pDict, **pOffDict))
+            lnlike32.parameters.update(dict(pDict, **pOffDict))
+            self.assertAlmostEqual(
+                lnlike32.log_likelihood(), lnlike64.log_likelihood(), delta=2e-3
+            )
+
+        # Float64 data are never sampled at lower precision
+        lnlike = lnlike_call(list(pDict), *data64, modelNum=111, nBits=32)
+        self.assertEqual(lnlike._qMod.dtype, np.float64)
+
+    def test_model_qu(self):
+        """Tests model_qu fills the same spectra that model returns."""
+        lamSqArr_m2 = self.data[0]
+        for modelNum, pDict in MODEL_PDICTS.items():
+            mod = load_model(modelNum)
+            qArr = np.empty_like(lamSqArr_m2)
+            uArr = np.empty_like(lamSqArr_m2)
+            mod.model_qu(pDict, lamSqArr_m2, qArr, uArr)
+            quArr = mod.model(pDict, lamSqArr_m2)
+            self.assertEqual(quArr.dtype, np.complex128)
+            np.testing.assert_array_equal(quArr.real, qArr)
+            np.testing.assert_array_equal(quArr.imag, uArr)
+
+    def test_model_batch(self):
+        """Tests array-valued parameters match one evaluation per set."""
+        lamSqArr_m2 = self.data[0]
+        rng = np.random.default_rng(42)
+        for modelNum, pDict in MODEL_PDICTS.items():
+            mod = load_model(modelNum)
+            pBatch = {
+                k: rng.uniform(mod.priors[k].minimum, mod.priors[k].maximum, (5, 1))
+                for k in pDict
+            }
+            quBatch = mod.model(pBatch, lamSqArr_m2)
+            self.assertEqual(quBatch.shape, (5, lamSqArr_m2.size))
+            for i, quArr in enumerate(quBatch):
+                pSetDict = {k: v[i, 0] for k, v in pBatch.items()}
+                np.testing.assert_allclose(
+                    quArr, mod.model(pSetDict, lamSqArr_m2), rtol=0, atol=1e-12
+                )
+
+            # Blocked evaluation, with one parameter held fixed across sets
+            k = next(iter(pDict))
+            pBatch[k] = pDict[k]
+            quBlkArr = evaluate_qu_model(mod.model_qu, pBatch, lamSqArr_m2, blockSize=2)
+            np.testing.assert_array_equal(quBlkArr, mod.model(pBatch, lamSqArr_m2))
+
+    def test_model_inputs(self):
+        """Tests model accepts a posterior row and any shape of lambda^2."""
+        lamSqArr_m2 = self.data[0]
+        for modelNum, pDict in MODEL_PDICTS.items():
+            mod = load_model(modelNum)
+            quArr = mod.model(pDict, lamSqArr_m2)
+            pRow = pd.Series(dict(pDict, log_likelihood=0.0))
+            np.testing.assert_array_equal(mod.model(pRow, lamSqArr_m2), quArr)
+            self.assertEqual(mod.model(pDict, lamSqArr_m2[5]), quArr[5])
+            # More rows than one evaluation block
+            np.testing.assert_array_equal(
+                mod.model(pDict, lamSqArr_m2.reshape(96, 3)), quArr.reshape(96, 3)
+            )
+
+    def test_slab_thin_limit(self):
+        """Tests the Burn slab models reduce to thin sources at deltaRM = 0."""
+        lamSqArr_m2 = self.data[0]
+        pDict = {
+            "fracPol1": 0.3,
+            "fracPol2": 0.2,
+            "psi01_deg": 40.0,
+            "psi02_deg": 120.0,
+            "RM1_radm2": 50.0,
+            "RM2_radm2": -30.0,
+            "deltaRM1_radm2": 0.0,
+            "deltaRM2_radm2": 0.0,
+        }
+        quArr = load_model(6).model(pDict, lamSqArr_m2)
+        quThinArr = load_model(11).model(pDict, lamSqArr_m2)
+        np.testing.assert_allclose(quArr, quThinArr, rtol=0, atol=1e-12)
+
+        pDict = {"fracPol": 0.3, "psi0_deg": 40.0, "RM_radm2": 50.0}
+        quArr = load_model(5).model(dict(pDict, deltaRM_radm2=0.0), lamSqArr_m2)
+        quThinArr = load_model(1).model(pDict, lamSqArr_m2)
+        np.testing.assert_allclose(quArr, quThinArr, rtol=0, atol=1e-12)
+
+
+if __name__ == "__main__":
+    unittest.main()